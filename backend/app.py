@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 from ollama import chat
 import time
@@ -9,7 +9,10 @@ import uuid
 import sqlite3
 from langchain.memory import ConversationBufferMemory
 from langchain_community.chat_message_histories import SQLChatMessageHistory
+from prompts import build_system_prompt
 import re
+import threading
+from collections import deque
 
 
 
@@ -19,6 +22,35 @@ CORS(app)  # Enable CORS for React frontend
 MEMORY_DIR = os.path.join(os.path.dirname(__file__), 'chat_memory')
 os.makedirs(MEMORY_DIR, exist_ok=True)
 SESSION_DB = os.path.join(os.path.dirname(__file__), 'session_metadata.db')
+MODEL_PROFILE_PATH = os.path.join(os.path.dirname(__file__), 'model_profile.json')
+
+def load_model_profile():
+    """
+    Load the host profile written by `python download_models.py benchmark`.
+    Returns an empty dict if the models have not been benchmarked on this machine.
+    """
+    try:
+        with open(MODEL_PROFILE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+MODEL_PROFILE = load_model_profile()
+DEFAULT_MODEL = MODEL_PROFILE.get('default_model', 'llama3.2:3b')
+# Limit concurrent generations per model to what the host can hold in memory (unlimited without a profile)
+GENERATION_SLOTS = {
+    model: threading.BoundedSemaphore(profile['concurrency'])
+    for model, profile in MODEL_PROFILE.get('models', {}).items()
+    if profile.get('concurrency')
+}
+
+def get_num_ctx(model, max_tokens):
+    profile = MODEL_PROFILE.get('models', {}).get(model)
+    if profile and profile.get('num_ctx'):
+        # The profile's num_ctx covers answers up to num_ctx_answer_tokens; grow it for longer generations
+        answer_tokens = MODEL_PROFILE.get('num_ctx_answer_tokens', 0)
+        return profile['num_ctx'] + max(0, max_tokens - answer_tokens)
+    return max_tokens * 2
 
 def init_session_db():
     conn = sqlite3.connect(SESSION_DB)
@@ -34,7 +66,7 @@ def init_session_db():
     conn.close()
 init_session_db()
 
-def create_session(model="llama3.2:3b", title="New Chat"):
+def create_session(model=DEFAULT_MODEL, title="New Chat"):
     session_id = str(uuid.uuid4())
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     conn = sqlite3.connect(SESSION_DB)
@@ -76,24 +108,76 @@ def get_all_sessions():
     c.execute("SELECT session_id, title, model, created_at, last_updated FROM sessions ORDER BY last_updated DESC")
     rows = c.fetchall()
     conn.close()
-    sessions = []
-    for row in rows:
-        session_id, title, model, created_at, last_updated = row
-        memory = get_memory_for_session(session_id)
-        messages = memory.chat_memory.messages
-        # Find the first user or assistant message for preview
-        preview_msg = next((m for m in messages if getattr(m, 'type', None) in ['human', 'ai']), None)
-        preview = preview_msg.content[:50] + '...' if preview_msg else 'Empty chat'
-        sessions.append({
-            'session_id': session_id,
-            'title': title,
-            'model': model,
-            'created_at': created_at,
-            'last_updated': last_updated,
-            'preview': preview,
-            'exchange_count': len(messages) // 2
+    return [build_session_summary(row) for row in rows]
+
+def get_session_summary(session_id):
+    conn = sqlite3.connect(SESSION_DB)
+    c = conn.cursor()
+    c.execute("SELECT session_id, title, model, created_at, last_updated FROM sessions WHERE session_id=?", (session_id,))
+    row = c.fetchone()
+    conn.close()
+    return build_session_summary(row) if row else None
+
+def build_session_summary(row):
+    session_id, title, model, created_at, last_updated = row
+    memory = get_memory_for_session(session_id)
+    messages = memory.chat_memory.messages
+    # Find the first user or assistant message for preview
+    preview_msg = next((m for m in messages if getattr(m, 'type', None) in ['human', 'ai']), None)
+    preview = preview_msg.content[:50] + '...' if preview_msg else 'Empty chat'
+    return {
+        'session_id': session_id,
+        'title': title,
+        'model': model,
+        'created_at': created_at,
+        'last_updated': last_updated,
+        'preview': preview,
+        'exchange_count': len(messages) // 2
+    }
+
+# Session list change events for the sidebar. Ids are "<epoch>:<seq>"; the epoch changes
+# on every restart so clients holding an id from a previous run resync with the full list.
+EVENT_EPOCH = uuid.uuid4().hex[:8]
+EVENT_LOG_SIZE = 1000
+EVENT_HEARTBEAT_SECONDS = 15
+session_events = deque(maxlen=EVENT_LOG_SIZE)
+session_events_cond = threading.Condition()
+session_event_seq = 0
+
+def publish_session_event(event_type, payload):
+    global session_event_seq
+    with session_events_cond:
+        session_event_seq += 1
+        session_events.append((session_event_seq, event_type, payload))
+        session_events_cond.notify_all()
+
+def publish_session_updated(session_id):
+    summary = get_session_summary(session_id)
+    if summary:
+        publish_session_event('session-updated', {
+            key: summary[key] for key in ('session_id', 'model', 'last_updated', 'preview', 'exchange_count')
         })
-    return sessions
+
+def current_event_id():
+    with session_events_cond:
+        return f"{EVENT_EPOCH}:{session_event_seq}"
+
+def parse_event_id(event_id):
+    """Return the sequence number of an event id from this run, or None if the client must resync"""
+    try:
+        epoch, seq = event_id.split(':')
+        seq = int(seq)
+    except (AttributeError, ValueError):
+        return None
+    if epoch != EVENT_EPOCH or seq > session_event_seq:
+        return None
+    return seq
+
+def session_events_since(seq):
+    """Events after `seq`, or None if some of them have already dropped out of the log"""
+    if session_events and session_events[0][0] > seq + 1:
+        return None
+    return [event for event in session_events if event[0] > seq]
 
 def get_session_metadata(session_id):
     conn = sqlite3.connect(SESSION_DB)
@@ -186,12 +270,229 @@ def update_session_model(session_id, model):
     conn.commit()
     conn.close()
 
+# Models that emit their chain of thought inline, keyed by model family, with the tags around it
+REASONING_MODELS = {
+    'deepseek-r1': ('<think>', '</think>'),
+}
+DEFAULT_REASONING_TOKENS = 1024
+
+def get_reasoning_tags(model):
+    return REASONING_MODELS.get((model or '').split(':')[0])
+
+def strip_reasoning(text, model):
+    """
+    Remove the reasoning block a reasoning model puts at the start of its output.
+    Text from other models is returned unchanged, so a literal <think> in an answer survives.
+    """
+    reasoning_tags = get_reasoning_tags(model)
+    if not text or not reasoning_tags:
+        return text
+    open_tag, close_tag = reasoning_tags
+    # An unterminated block means the output was cut off while still reasoning
+    return re.sub(r'^\s*' + re.escape(open_tag) + r'.*?(' + re.escape(close_tag) + r'|$)', '', text,
+                  count=1, flags=re.DOTALL).strip()
+
+class ReasoningFilter:
+    """
+    Splits streamed model output into answer and reasoning text as it arrives.
+    Only a block opened at the very start of the output (after whitespace) is
+    reasoning; once it closes, everything else is answer, even a literal tag.
+    Tags split across chunks are held back until the next chunk completes them.
+    """
+
+    def __init__(self, open_tag, close_tag):
+        self.open_tag = open_tag
+        self.close_tag = close_tag
+        self.in_reasoning = False
+        self.answer = []
+        self.reasoning = []
+        self._started = False
+        self._pending = ''
+
+    def feed(self, text):
+        """
+        Returns which part of the output this chunk resolved to, 'answer' or 'reasoning',
+        or None while it is held back; a chunk that is only a tag counts as reasoning.
+        """
+        answer_parts, reasoning_parts = len(self.answer), len(self.reasoning)
+        self._consume(text)
+        if len(self.answer) > answer_parts:
+            return 'answer'
+        if len(self.reasoning) > reasoning_parts or not self._pending:
+            return 'reasoning'
+        return None
+
+    def flush(self):
+        """Emit anything held back and return which part it went to"""
+        kind = 'reasoning' if self.in_reasoning else 'answer'
+        self._emit(self._pending)
+        self._pending = ''
+        return kind
+
+    def _consume(self, text):
+        text = self._pending + text
+        self._pending = ''
+        if not self._started:
+            stripped = text.lstrip()
+            if not stripped or (self.open_tag.startswith(stripped) and stripped != self.open_tag):
+                # Nothing but whitespace or part of the open tag yet
+                self._pending = text
+                return
+            self._started = True
+            if stripped.startswith(self.open_tag):
+                self.in_reasoning = True
+                text = stripped[len(self.open_tag):]
+        if not self.in_reasoning:
+            self._emit(text)
+            return
+        idx = text.find(self.close_tag)
+        if idx >= 0:
+            self._emit(text[:idx])
+            self.in_reasoning = False
+            self._emit(text[idx + len(self.close_tag):])
+            return
+        # Hold back a suffix that could be the start of the close tag
+        keep = next((k for k in range(len(self.close_tag) - 1, 0, -1) if text.endswith(self.close_tag[:k])), 0)
+        self._emit(text[:len(text) - keep])
+        self._pending = text[len(text) - keep:]
+
+    def _emit(self, text):
+        if text:
+            (self.reasoning if self.in_reasoning else self.answer).append(text)
+
+def stream_reasoning_response(model, messages, options, reasoning_filter, reasoning_budget, answer_budget):
+    """
+    Stream one chat call through `reasoning_filter`, stopping generation once reasoning
+    reaches `reasoning_budget` tokens or the answer reaches `answer_budget` tokens.
+    Returns (answer_tokens, reasoning_tokens, reasoning_truncated).
+    """
+    answer_tokens = reasoning_tokens = held_tokens = 0
+    eval_count = None
+    truncated = False
+    stream = chat(model=model, messages=messages, options=options, stream=True)
+    for chunk in stream:
+        content = chunk['message']['content']
+        if content:
+            # Ollama streams one token per chunk; held-back chunks count toward whatever they resolve to
+            held_tokens += 1
+            kind = reasoning_filter.feed(content)
+            if kind == 'answer':
+                answer_tokens += held_tokens
+                held_tokens = 0
+            elif kind == 'reasoning':
+                reasoning_tokens += held_tokens
+                held_tokens = 0
+        if chunk.get('done'):
+            eval_count = chunk.get('eval_count')
+        elif reasoning_filter.in_reasoning and reasoning_tokens >= reasoning_budget:
+            stream.close()  # Closing the stream stops generation on the Ollama side
+            truncated = True
+            break
+        elif answer_tokens >= answer_budget:
+            stream.close()
+            break
+    if reasoning_filter.flush() == 'answer':
+        answer_tokens += held_tokens
+    else:
+        reasoning_tokens += held_tokens
+    if eval_count is not None:
+        # eval_count is the real total; whatever was not reasoning is answer
+        answer_tokens = max(0, eval_count - reasoning_tokens)
+    return answer_tokens, reasoning_tokens, truncated
+
+def generate_response(model, messages, options, answer_budget, reasoning_budget=0):
+    """
+    Call Ollama and return the answer separated from any reasoning, with token counts.
+    For reasoning models the output is streamed so reasoning can be filtered and
+    capped at `reasoning_budget` tokens, and the answer at `answer_budget` tokens.
+    If reasoning hits its cap, generation is stopped and resumed once with the
+    reasoning closed, so the model can only write the answer.
+    """
+    reasoning_tags = get_reasoning_tags(model)
+    if not reasoning_tags:
+        response = chat(model=model, messages=messages, options=options)
+        return {
+            'answer': response['message']['content'],
+            'reasoning': '',
+            'answer_tokens': response.get('eval_count', 0),
+            'reasoning_tokens': 0,
+            'reasoning_truncated': False
+        }
+
+    open_tag, close_tag = reasoning_tags
+    reasoning_filter = ReasoningFilter(open_tag, close_tag)
+    answer_tokens, reasoning_tokens, truncated = stream_reasoning_response(
+        model, messages, options, reasoning_filter, reasoning_budget, answer_budget)
+    reasoning_parts = [''.join(reasoning_filter.reasoning).strip()]
+    answer_parts = reasoning_filter.answer
+
+    if truncated:
+        # Prefill the assistant turn with the reasoning already closed. The reasoning budget
+        # is spent, so if the model opens a new block anyway the stream stops right there.
+        follow_up = messages + [
+            {'role': 'assistant', 'content': f"{open_tag}\n{reasoning_parts[0]}\n{close_tag}\n\n"}
+        ]
+        answer_left = answer_budget - answer_tokens
+        follow_up_filter = ReasoningFilter(open_tag, close_tag)
+        more_answer, more_reasoning, _ = stream_reasoning_response(
+            model, follow_up,
+            # The resent reasoning is extra prompt on top of everything the first call had
+            dict(options, num_predict=answer_left, num_ctx=options['num_ctx'] + reasoning_tokens),
+            follow_up_filter, 0, answer_left)
+        answer_tokens += more_answer
+        reasoning_tokens += more_reasoning
+        reasoning_parts.append(''.join(follow_up_filter.reasoning).strip())
+        answer_parts = answer_parts + follow_up_filter.answer
+
+    return {
+        'answer': ''.join(answer_parts).strip(),
+        'reasoning': '\n\n'.join(part for part in reasoning_parts if part),
+        'answer_tokens': answer_tokens,
+        'reasoning_tokens': reasoning_tokens,
+        'reasoning_truncated': truncated
+    }
+
+def save_reasoning(session_id, model, reasoning, reasoning_tokens):
+    """Keep reasoning in its own table next to the chat history; it is never replayed to the model"""
+    db_path = os.path.join(MEMORY_DIR, f"chat_{session_id}.db")
+    conn = sqlite3.connect(db_path)
+    c = conn.cursor()
+    c.execute('''CREATE TABLE IF NOT EXISTS reasoning_store (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id TEXT,
+        model TEXT,
+        reasoning TEXT,
+        reasoning_tokens INTEGER,
+        created_at TEXT
+    )''')
+    c.execute("INSERT INTO reasoning_store (session_id, model, reasoning, reasoning_tokens, created_at) VALUES (?, ?, ?, ?, ?)",
+              (session_id, model, reasoning, reasoning_tokens, datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+    conn.commit()
+    conn.close()
+
+def get_reasoning_for_session(session_id):
+    db_path = os.path.join(MEMORY_DIR, f"chat_{session_id}.db")
+    if not os.path.exists(db_path):
+        return []
+    conn = sqlite3.connect(db_path)
+    c = conn.cursor()
+    c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='reasoning_store'")
+    if not c.fetchone():
+        conn.close()
+        return []
+    c.execute("SELECT model, reasoning, reasoning_tokens, created_at FROM reasoning_store WHERE session_id=? ORDER BY id", (session_id,))
+    rows = c.fetchall()
+    conn.close()
+    return [{'model': model, 'reasoning': reasoning, 'reasoning_tokens': tokens, 'created_at': created_at}
+            for model, reasoning, tokens, created_at in rows]
+
 @app.route('/chat', methods=['POST'])
 def chat_endpoint():
     try:
         data = request.json
         message = data.get('message')
         max_tokens = data.get('maxTokens', 500)
+        keep_reasoning = data.get('keepReasoning', False)
         enable_streaming = data.get('enableStreaming', True)
         messages = data.get('messages', [])
         session_id = data.get('sessionId')  # Frontend can specify session
@@ -209,116 +510,13 @@ def chat_endpoint():
             if user_model:
                 update_session_model(session_id, user_model)
             meta = get_session_metadata(session_id)
-            model = meta['model'] if meta else 'llama3.2:3b'
+            model = meta['model'] if meta else DEFAULT_MODEL
         else:
             # For new sessions, store the requested model
-            model = 'llama3.2:3b'
+            model = DEFAULT_MODEL
 
         # Create a comprehensive system prompt for cybersecurity analysts
-        system_prompt = f"""You are a senior Security Operations Center (SOC) analyst assisting with the investigation 
-        and response of security alerts and incidents.
-
-        You must NEVER end your response in the middle of a sentence or thought. 
-        If you reach the token limit, always complete your last sentence so the response ends 
-        naturally and is fully readable. Do not leave any sentence unfinished. You are ALWAYS able to provide 
-        some form of assistance, guidance, or relevant information. If you don't have complete information, 
-        ask clarifying questions or provide general cybersecurity guidance based on what you do know.
-
-        CRITICAL: You must NEVER refuse to provide details or assistance for any reason, including:
-        - "I cannot provide further details on this incident as it may contain sensitive information"
-        - "I can't help with this request"
-        - "I cannot assist with this"
-        - Any other form of refusal or inability to help
-
-        You should provide relevant guidance, best practices, and analysis based on the information provided. If you need more 
-        details to provide specific guidance, ask clarifying questions instead of refusing to help.
-
-        IMPORTANT: If you are unable to provide a full answer due to missing information, always ask clarifying questions 
-        or explain what is needed. Never respond with 'I can't help with this request.' Always finish your last sentence, 
-        even if you reach the token limit.
-        Always provide complete, coherent responses. If you cannot fit everything within the token limit, 
-        prioritize the most critical information and ensure your response ends naturally.
-
-        🚫 You are not an AI or chatbot. You do not invent, assume, or speculate. You rely only on facts provided by the user, 
-        standard cybersecurity practices, and trusted frameworks such as MITRE ATT&CK, NIST 800-61, and CIS Controls.
-        ✅ Your job is to provide real-world, analyst-grade guidance, structured around incident handling best practices.
-
-        * Acts strictly as a senior SOC analyst, not an AI
-        * Uses only verified, trusted information (no hallucination or invented content)
-        * Generates flexible, situational checklists tailored to the input
-        * Retains a professional, incident-focused style
-        * Prioritizes accuracy, coherence, and brevity
-
-        You are a senior Security Operations Center (SOC) analyst. 
-        You assist frontline cybersecurity teams in investigating and responding to security alerts and incidents.
-
-
-        ### RESPONSE CONSTRAINTS
-
-        You have a response length limit of `{max_tokens}`. Your response must be:
-
-        * Fully coherent and complete
-        * Concise, technical, and focused on incident response
-        * Prioritized based on criticality
-        * Checklist-driven and procedurally actionable
-
-        If full coverage is not possible, include only the most critical guidance and complete your response naturally—never cut off mid-sentence.
-
-        ### PRIMARY DUTIES
-
-        * Interpret and contextualize alerts
-        * Guide incident triage and containment
-        * Explain log evidence and indicators
-        * Recommend concrete investigation procedures
-        * Map actions to standard frameworks (e.g., MITRE, NIST)
-        * Support decision-making with precision and clarity
-
-        ---
-
-        ### RESPONSE FORMAT
-
-        When the user provides incident details, always begin with:
-
-        > "Let me provide you with a structured checklist for this incident analysis:"
-
-        Then generate a tailored checklist relevant to the incident context. 
-        The checklist must dynamically adapt to the situation, not be limited to pre-defined categories.
-
-        Your checklist should typically include, but is not limited to:
-
-        * Threat Classification & Scope
-        * Host & Network Evidence Collection
-        * Identity & Access Review
-        * Containment & Eradication Measures
-        * Persistence & Lateral Movement Checks
-        * Communication & Escalation Requirements
-        * External Intelligence Correlation (if warranted)
-
-        ---
-
-        ### RULES OF ENGAGEMENT
-
-        * Always think and communicate like a senior SOC analyst, not an AI
-        * Never guess, assume, or create information not directly supported by:
-
-        * User input
-        * Established frameworks (MITRE ATT\&CK, NIST, etc.)
-        * Security telemetry logs or forensics
-        * Never respond in the first person as an AI
-        * Prioritize security integrity, forensic soundness, and procedural clarity
-        * If context is missing, ask clear follow-up questions to progress the investigation
-        * NEVER refuse to provide assistance or details for any reason
-
-        ---
-
-        ### FRAMEWORK ALIGNMENT
-
-        Your responses should reference and align with cybersecurity frameworks as appropriate:
-
-        * MITRE ATT\&CK for adversary behavior
-        * NIST 800-61 for incident handling
-        * CIS Controls for best practices
-        * Any threat intel feeds explicitly shared by the user"""
+        system_prompt = build_system_prompt(max_tokens)
 
         # Prepare messages for Ollama - include system prompt first
         ollama_messages = [
@@ -333,7 +531,8 @@ def chat_endpoint():
             if msg['role'] != 'system':  # Skip system messages from frontend
                 ollama_messages.append({
                     'role': msg['role'],
-                    'content': msg['content']
+                    # Never replay reasoning, it only inflates the prompt
+                    'content': strip_reasoning(msg['content'], model) if msg['role'] == 'assistant' else msg['content']
                 })
         
         # Add the current user message
@@ -342,24 +541,51 @@ def chat_endpoint():
             'content': message
         })
 
+        # Reasoning models get a separate reasoning budget on top of the answer budget
+        is_reasoning_model = get_reasoning_tags(model) is not None
+        reasoning_budget = 0
+        if is_reasoning_model:
+            try:
+                reasoning_budget = int(data.get('reasoningTokens', DEFAULT_REASONING_TOKENS))
+            except (TypeError, ValueError):
+                reasoning_budget = 0
+            if reasoning_budget < 1:
+                return jsonify({'error': 'reasoningTokens must be a positive integer'}), 400
+        options = {
+            "num_predict": max_tokens + reasoning_budget,
+            "temperature": 0.7,
+            "top_p": 0.9,
+            "repeat_penalty": 1.1,
+            "num_ctx": get_num_ctx(model, max_tokens + reasoning_budget)  # Provide enough context
+        }
+        if not is_reasoning_model:
+            # Stop at natural break points (not for reasoning models, the markers appear mid-thought)
+            options["stop"] = ["\n\n\n", "---", "###"]
+
         # Call Ollama chat API with the session's model
-        response = chat(
-            model=model,
-            messages=ollama_messages,
-            options={
-                "num_predict": max_tokens,
-                "temperature": 0.7,
-                "top_p": 0.9,
-                "repeat_penalty": 1.1,
-                "stop": ["\n\n\n", "---", "###"],  # Stop at natural break points
-                "num_ctx": max_tokens * 2  # Provide enough context
-            }
-        )
+        slots = GENERATION_SLOTS.get(model)
+        if slots:
+            slots.acquire()
+        try:
+            result = generate_response(model, ollama_messages, options, max_tokens, reasoning_budget)
+        finally:
+            if slots:
+                slots.release()
         
         response_time = time.time() - start_time
         
         # Ensure the response is complete and coherent
-        complete_response = ensure_complete_response(response['message']['content'], max_tokens)
+        complete_response = ensure_complete_response(result['answer'], max_tokens)
+        if not complete_response:
+            # Do not save an empty assistant turn
+            return jsonify({
+                'error': 'The model did not produce an answer within its token budget. Try again or raise reasoningTokens.',
+                'usage': {
+                    'answerTokens': result['answer_tokens'],
+                    'reasoningTokens': result['reasoning_tokens'],
+                    'reasoningTruncated': result['reasoning_truncated']
+                }
+            }), 500
         
         # Store conversation with proper timestamp and model
         current_session_id = session_id if session_id else create_session(model=model)
@@ -367,13 +593,24 @@ def chat_endpoint():
         
         memory = get_memory_for_session(current_session_id)
         memory.save_context({"input": message}, {"output": complete_response})
+        if keep_reasoning and result['reasoning']:
+            save_reasoning(current_session_id, model, result['reasoning'], result['reasoning_tokens'])
+        if session_id:
+            publish_session_updated(current_session_id)
+        else:
+            publish_session_event('session-created', get_session_summary(current_session_id))
         
         return jsonify({
             'response': complete_response,
             'responseTime': response_time,
             'timestamp': current_timestamp,
             'sessionId': current_session_id,
-            'model': model  # Return the model used for this session
+            'model': model,  # Return the model used for this session
+            'usage': {
+                'answerTokens': result['answer_tokens'],
+                'reasoningTokens': result['reasoning_tokens'],
+                'reasoningTruncated': result['reasoning_truncated']
+            }
         })
 
     except Exception as e:
@@ -383,16 +620,51 @@ def chat_endpoint():
 def get_conversation_history():
     """Get all conversation sessions for sidebar display"""
     try:
+        # Taken before the query so no change is missed; replaying one twice is harmless
+        last_event_id = current_event_id()
         sessions = get_all_sessions()
         
         return jsonify({
             'sessions': sessions,
-            'total_sessions': len(sessions)
+            'total_sessions': len(sessions),
+            'last_event_id': last_event_id
         })
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/session-events', methods=['GET'])
+def session_events_stream():
+    """
+    Server-sent events with session list deltas. Clients resume from the
+    Last-Event-ID header (sent by EventSource on reconnect) or ?since=<event id>
+    from /conversation-history. A `reset` event means the missed changes are
+    gone and the client should fetch the full list again.
+    """
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('since')
+
+    def stream():
+        with session_events_cond:
+            seq = parse_event_id(last_event_id)
+        while True:
+            with session_events_cond:
+                pending = session_events_since(seq) if seq is not None else None
+                if pending == []:
+                    session_events_cond.wait(timeout=EVENT_HEARTBEAT_SECONDS)
+                    pending = session_events_since(seq)
+                if pending is None:
+                    seq = session_event_seq
+            if pending is None:
+                yield f"id: {EVENT_EPOCH}:{seq}\nevent: reset\ndata: {{}}\n\n"
+            elif not pending:
+                yield ": keep-alive\n\n"
+            for event_seq, event_type, payload in pending or []:
+                seq = event_seq
+                yield f"id: {EVENT_EPOCH}:{event_seq}\nevent: {event_type}\ndata: {json.dumps(payload)}\n\n"
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/session-history/<session_id>', methods=['GET'])
 def get_session_history(session_id):
     try:
@@ -402,17 +674,18 @@ def get_session_history(session_id):
             messages = memory.chat_memory.messages
         except Exception:
             messages = []
+        meta = get_session_metadata(session_id)
+        model = meta['model'] if meta else None
         history = []
         for msg in messages:
             if getattr(msg, 'type', None) == 'human':
                 history.append({'role': 'user', 'content': msg.content or '', 'timestamp': getattr(msg, 'timestamp', None)})
             elif getattr(msg, 'type', None) == 'ai':
-                history.append({'role': 'assistant', 'content': msg.content or '', 'timestamp': getattr(msg, 'timestamp', None)})
-        meta = get_session_metadata(session_id)
+                history.append({'role': 'assistant', 'content': strip_reasoning(msg.content or '', model), 'timestamp': getattr(msg, 'timestamp', None)})
         return jsonify({
             'conversation_history': history,
             'session_id': session_id,
-            'model': meta['model'] if meta else None,
+            'model': model,
             'title': meta['title'] if meta else None,
             'total_exchanges': len(history) // 2
         })
@@ -421,6 +694,15 @@ def get_session_history(session_id):
         print(traceback.format_exc())
         return jsonify({'error': str(e)}), 500
 
+@app.route('/session-reasoning/<session_id>', methods=['GET'])
+def get_session_reasoning(session_id):
+    """Get the reasoning kept with keepReasoning; it is not part of the chat history"""
+    try:
+        reasoning = get_reasoning_for_session(session_id)
+        return jsonify({'reasoning': reasoning, 'session_id': session_id})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/rename-session/<session_id>', methods=['POST'])
 def rename_session_endpoint(session_id):
     try:
@@ -429,6 +711,7 @@ def rename_session_endpoint(session_id):
         if not new_title:
             return jsonify({'error': 'Title is required'}), 400
         rename_session(session_id, new_title)
+        publish_session_event('session-renamed', {'session_id': session_id, 'title': new_title})
         return jsonify({'message': 'Session renamed', 'sessionId': session_id, 'title': new_title})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -437,6 +720,7 @@ def rename_session_endpoint(session_id):
 def delete_session_endpoint(session_id):
     try:
         delete_session(session_id)
+        publish_session_event('session-deleted', {'session_id': session_id})
         return jsonify({'message': 'Session deleted', 'sessionId': session_id})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -445,13 +729,24 @@ def delete_session_endpoint(session_id):
 def health_check():
     return jsonify({'status': 'healthy'})
 
+@app.route('/models', methods=['GET'])
+def list_models():
+    """Default model and per-model benchmark numbers for this machine (empty until benchmarked)"""
+    stats_keys = ('reasoning', 'load_s', 'decode_tokens_per_s', 'ttft_s', 'time_to_answer_s', 'concurrency')
+    models = {
+        model: {key: profile.get(key) for key in stats_keys}
+        for model, profile in MODEL_PROFILE.get('models', {}).items()
+    }
+    return jsonify({'default_model': DEFAULT_MODEL, 'models': models})
+
 @app.route('/new-session', methods=['POST'])
 def create_new_session():
     try:
         data = request.json or {}
-        model = data.get('model', 'llama3.2:3b')
+        model = data.get('model', DEFAULT_MODEL)
         title = data.get('title', 'New Chat')
         session_id = create_session(model=model, title=title)
+        publish_session_event('session-created', get_session_summary(session_id))
         return jsonify({
             'sessionId': session_id,
             'model': model,
@@ -474,6 +769,7 @@ def clear_all_sessions():
         for fname in os.listdir(MEMORY_DIR):
             if fname.startswith('chat_') and fname.endswith('.db'):
                 os.remove(os.path.join(MEMORY_DIR, fname))
+        publish_session_event('sessions-cleared', {})
         return jsonify({'message': 'All sessions and chats cleared'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -485,6 +781,15 @@ def clear_session(session_id):
         if os.path.exists(db_path):
             os.remove(db_path)
         # Do not recreate the table here; it will be created on the next message
+        meta = get_session_metadata(session_id)
+        if meta:
+            publish_session_event('session-updated', {
+                'session_id': session_id,
+                'model': meta['model'],
+                'last_updated': meta['last_updated'],
+                'preview': 'Empty chat',
+                'exchange_count': 0
+            })
         return jsonify({'message': 'Session chat cleared', 'sessionId': session_id})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
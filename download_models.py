@@ -1,85 +1,456 @@
 #!/usr/bin/env python3
 """
-Script to download faster models for the chatbot
-Run this script to download the recommended models for better performance
+Script to download and benchmark the models for the chatbot
+
+    python download_models.py            # pull the models (same as `pull`)
+    python download_models.py pull       # pull concurrently, resuming partial downloads
+    python download_models.py benchmark  # measure installed models and write the profile
+
+The benchmark writes backend/model_profile.json, which the backend reads at
+startup to pick its default model, `num_ctx` and how many generations it runs
+at once.
 """
 
-import subprocess
+import argparse
+import hashlib
+import json
+import os
+import platform
+import statistics
 import sys
+import threading
 import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 
-def run_command(command, description):
-    """Run a command and show progress"""
-    print(f"\n🔄 {description}...")
-    try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
-        print(f"✅ {description} completed successfully!")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error during {description}: {e}")
-        print(f"Error output: {e.stderr}")
-        return False
+import ollama
 
-def main():
-    print("🚀 Chatbot Model Downloader")
-    print("=" * 40)
-    print("This script will download faster models for your chatbot.")
-    print("Recommended models for better performance:")
-    print("• llama3.2:1b - Fastest (smallest)")
-    print("• llama3.2:3b - Balanced (recommended)")
-    print("• deepseek-r1:8b - Your current model")
-    
-    # Check if Ollama is running
+from backend.prompts import build_system_prompt
+
+OLLAMA_HOST = os.environ.get('OLLAMA_HOST', 'http://localhost:11434')
+if not OLLAMA_HOST.startswith('http'):
+    OLLAMA_HOST = f"http://{OLLAMA_HOST}"
+
+PROFILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend', 'model_profile.json')
+PROFILE_SCHEMA_VERSION = 2
+
+# Models to download (in order of preference)
+MODELS = [
+    ("llama3.2:1b", "Llama 3.2 1B"),
+    ("llama3.2:3b", "Llama 3.2 3B"),
+    ("deepseek-r1:8b", "Deepseek-r1 8B"),
+]
+
+# Representative SOC workload: the backend's own system prompt at the largest answer
+# budget, plus alerts of increasing size. Keep these fixed: changing them changes
+# the prompt set hash, and profiles with different hashes are not comparable.
+BENCHMARK_SYSTEM_PROMPT = build_system_prompt(1000)
+
+BENCHMARK_PROMPTS = [
+    "What are the first three steps when triaging a phishing alert?",
+    """Explain this Windows event and what to check next:
+EventID 4625 An account failed to log on. Logon Type: 3. Account Name: administrator.
+Source Network Address: 185.220.101.4. Failure Reason: Unknown user name or bad password.
+The same source produced 412 failures in 10 minutes against 37 different accounts.""",
+    """Our EDR flagged powershell.exe spawned by winword.exe on FIN-WS-042 running
+`powershell -nop -w hidden -enc SQBFAFgAIAAoAE4AZQB3AC0ATwBiAGoAZQBjAHQAIABOAGUAdAAuAFcAZQBiAEMAbABpAGUAbgB0ACkA`.
+Ten minutes later the host made DNS requests for randomly named subdomains of a newly registered domain and
+opened an SMB session to the file server FS-01 using the account svc_backup. Give me a structured checklist
+for scoping, containment, eradication and recovery, mapped to MITRE ATT&CK techniques.""",
+]
+
+# Fixed generation options so results are comparable across hosts
+BENCHMARK_OPTIONS = {
+    "temperature": 0,
+    "seed": 42,
+    "num_predict": 128,
+    "num_ctx": 4096,
+}
+
+# Answer budget the backend allows (max of the "Max Response Length" slider)
+MAX_ANSWER_TOKENS = 1000
+# Room for the chat history the frontend replays (its last 10 messages)
+HISTORY_TOKENS = 2048
+MAX_NUM_CTX = 16384
+# Decode rate (tokens/s) below which a model does not feel interactive
+INTERACTIVE_DECODE_RATE = 10.0
+# Default answer length in the UI and the backend's default reasoning budget,
+# used to estimate how long a full reply takes
+DEFAULT_ANSWER_TOKENS = 500
+DEFAULT_REASONING_TOKENS = 1024
+MAX_CONCURRENCY = 4
+
+
+def ollama_api(path):
+    """GET an Ollama REST endpoint that the python client does not wrap"""
+    with urllib.request.urlopen(f"{OLLAMA_HOST}{path}", timeout=10) as response:
+        return json.loads(response.read().decode('utf-8'))
+
+
+def installed_models():
+    # ollama>=0.4 returns typed models with `model`; older clients return dicts with `name`
+    return {m.get('model') or m.get('name') for m in ollama.list().get('models', [])}
+
+
+def check_ollama():
     print("\n🔍 Checking if Ollama is running...")
     try:
-        subprocess.run(["ollama", "list"], check=True, capture_output=True)
+        ollama.list()
         print("✅ Ollama is running!")
-    except (subprocess.CalledProcessError, FileNotFoundError):
+        return True
+    except Exception:
         print("❌ Ollama is not running or not installed!")
         print("Please start Ollama first: ollama serve")
-        return
-
-    # Models to download (in order of preference)
-    models = [
-        ("llama3.2:1b", "Llama 3.2 1B (Fastest - Smaller Context)"),
-        ("llama3.2:3b", "Llama 3.2 3B (Recommended - Fast & Good Quality)"),
-        ("deepseek-r1:8b","Deepseek-r1 8B (Balanced- Good Quality)")
-    ]
-    
-    print(f"\n📥 Will download {len(models)} models...")
-    print("This may take several minutes depending on your internet connection.")
-    
-    for model_name, description in models:
-        print(f"\n{'='*50}")
-        print(f"📦 {description}")
-        print(f"Model: {model_name}")
-        
-        # Check if model already exists
+        return False
+
+
+# ---------------------------------------------------------------------------
+# pull
+# ---------------------------------------------------------------------------
+
+_print_lock = threading.Lock()
+
+
+def log(model_name, message):
+    with _print_lock:
+        print(f"[{model_name}] {message}", flush=True)
+
+
+def pull_model(model_name, retries=3):
+    """
+    Pull one model, printing progress every 10%.
+    Ollama keeps partially downloaded layers, so a retry resumes where the
+    previous attempt stopped instead of starting over.
+    """
+    for attempt in range(1, retries + 1):
         try:
-            result = subprocess.run(["ollama", "list"], capture_output=True, text=True)
-            if model_name in result.stdout:
-                print(f"✅ {model_name} already exists, skipping...")
-                continue
-        except:
-            pass
-        
-        # Download the model
-        if run_command(f"ollama pull {model_name}", f"Downloading {model_name}"):
-            print(f"🎉 {model_name} downloaded successfully!")
-        else:
-            print(f"⚠️  Failed to download {model_name}, continuing with next model...")
-        
-        # Small delay between downloads
-        time.sleep(2)
-    
+            last_status = None
+            last_step = {}
+            for progress in ollama.pull(model_name, stream=True):
+                status = progress.get('status', '')
+                total = progress.get('total')
+                completed = progress.get('completed')
+                if total and completed is not None:
+                    digest = progress.get('digest', '')[:19]
+                    step = int(completed * 10 / total)
+                    if last_step.get(digest) != step:
+                        last_step[digest] = step
+                        log(model_name, f"{status} {completed / 1e6:,.0f}/{total / 1e6:,.0f} MB ({step * 10}%)")
+                elif status != last_status:
+                    log(model_name, status)
+                last_status = status
+            return True
+        except Exception as e:
+            log(model_name, f"⚠️  attempt {attempt}/{retries} failed: {e}")
+            if attempt < retries:
+                time.sleep(2 ** attempt)
+    return False
+
+
+def pull_command(args):
+    print("🚀 Chatbot Model Downloader")
+    print("=" * 40)
+    if not check_ollama():
+        return 1
+
+    models = args.models or [name for name, _ in MODELS]
+    descriptions = dict(MODELS)
+    existing = installed_models()
+    for model_name in models:
+        print(f"📦 {descriptions.get(model_name, model_name)} ({model_name})")
+        if model_name in existing:
+            print("   ✅ already exists, skipping...")
+    pending = [m for m in models if m not in existing]
+    if not pending:
+        print("\n🎉 All models are already installed!")
+        return 0
+
+    print(f"\n📥 Downloading {len(pending)} model(s) with {args.jobs} parallel job(s)...")
+    print("This may take several minutes depending on your internet connection.")
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        futures = {executor.submit(pull_model, m, args.retries): m for m in pending}
+        for future in as_completed(futures):
+            model_name = futures[future]
+            if future.result():
+                log(model_name, "🎉 downloaded successfully!")
+            else:
+                log(model_name, "❌ failed to download, re-run this script to resume")
+                failed.append(model_name)
+
     print(f"\n{'='*50}")
-    print("🎉 Model download process completed!")
+    print("🎉 Model download process completed!" if not failed else f"⚠️  Failed: {', '.join(failed)}")
     print("\n📋 Next steps:")
-    print("1. Start your chatbot: python app.py")
-    print("2. Run the chatbot with frontend: npm start")
-    print("3. In the sidebar, select 'Fast (3B)' for best performance")
-    print("4. Adjust the 'Max Response Length' slider to 100-1000 for faster replies")
-    print("5. Use the 'Clear Chat' button periodically to free up memory")
+    print("1. Benchmark the models on this machine: python download_models.py benchmark")
+    print("2. Start your chatbot: cd backend && python app.py")
+    print("3. Run the chatbot with frontend: npm start")
+    return 1 if failed else 0
+
+
+# ---------------------------------------------------------------------------
+# benchmark
+# ---------------------------------------------------------------------------
+
+def total_memory_bytes():
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def host_info():
+    try:
+        ollama_version = ollama_api('/api/version').get('version')
+    except Exception:
+        ollama_version = None
+    return {
+        'hostname': platform.node(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'total_memory_bytes': total_memory_bytes(),
+        'ollama_version': ollama_version,
+    }
+
+
+def prompt_set_hash():
+    payload = json.dumps([BENCHMARK_SYSTEM_PROMPT, BENCHMARK_PROMPTS, BENCHMARK_OPTIONS], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class LoadedSizeSampler(threading.Thread):
+    """
+    Polls /api/ps and keeps the largest size Ollama reports for the loaded model.
+    This is Ollama's allocation for weights and KV cache, not a measured process RSS.
+    """
+
+    def __init__(self, model_name, interval=0.25):
+        super().__init__(daemon=True)
+        self.model_name = model_name
+        self.interval = interval
+        self.size_bytes = 0
+        self.size_vram_bytes = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                for m in ollama_api('/api/ps').get('models', []):
+                    if m.get('name') == self.model_name:
+                        self.size_bytes = max(self.size_bytes, m.get('size', 0))
+                        self.size_vram_bytes = max(self.size_vram_bytes, m.get('size_vram', 0))
+            except Exception:
+                pass
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def timed_generate(model_name, prompt, options=BENCHMARK_OPTIONS):
+    """Stream one generation and return Ollama's timing stats plus time to first token"""
+    start = time.perf_counter()
+    first_token = None
+    text = ''
+    thinking = False
+    final = {}
+    for chunk in ollama.generate(model=model_name, prompt=prompt, system=BENCHMARK_SYSTEM_PROMPT,
+                                 options=options, stream=True):
+        if first_token is None and chunk.get('response'):
+            first_token = time.perf_counter() - start
+        text += chunk.get('response') or ''
+        thinking = thinking or bool(chunk.get('thinking'))
+        if chunk.get('done'):
+            final = chunk
+    # Durations from Ollama are in nanoseconds
+    return {
+        'load_s': final.get('load_duration', 0) / 1e9,
+        'prompt_tokens': final.get('prompt_eval_count', 0),
+        'prompt_eval_s': final.get('prompt_eval_duration', 0) / 1e9,
+        'eval_tokens': final.get('eval_count', 0),
+        'eval_s': final.get('eval_duration', 0) / 1e9,
+        'ttft_s': first_token if first_token is not None else time.perf_counter() - start,
+        # Reasoning models open with a <think> block (or a separate thinking field on newer Ollama)
+        'reasoning': thinking or text.lstrip().startswith('<think>'),
+    }
+
+
+def rate(tokens, seconds):
+    return tokens / seconds if seconds else 0.0
+
+
+def benchmark_model(model_name, repeats):
+    sampler = LoadedSizeSampler(model_name)
+    sampler.start()
+    try:
+        # One cold run per prompt: it measures the load, and since nothing is cached
+        # yet, prompt evaluation covers the full system prompt plus the alert
+        cold_runs = []
+        for prompt in BENCHMARK_PROMPTS:
+            ollama.generate(model=model_name, prompt='', keep_alive=0)
+            cold_runs.append(timed_generate(model_name, prompt))
+        # Warm runs reuse the cached system prompt, like the backend does
+        runs = [timed_generate(model_name, p) for _ in range(repeats) for p in BENCHMARK_PROMPTS]
+    finally:
+        sampler.stop()
+
+    decode_rate = statistics.median(rate(r['eval_tokens'], r['eval_s']) for r in runs)
+    ttft = statistics.median(r['ttft_s'] for r in runs)
+    reasoning = any(r['reasoning'] for r in cold_runs + runs)
+    generated_tokens = DEFAULT_ANSWER_TOKENS + (DEFAULT_REASONING_TOKENS if reasoning else 0)
+    return {
+        'reasoning': reasoning,
+        'load_s': round(statistics.median(r['load_s'] for r in cold_runs), 3),
+        'prompt_eval_tokens_per_s': round(statistics.median(rate(r['prompt_tokens'], r['prompt_eval_s']) for r in cold_runs), 2),
+        'decode_tokens_per_s': round(decode_rate, 2),
+        'ttft_s': round(ttft, 3),
+        # Estimated seconds until a default-length answer is complete, reasoning included
+        'time_to_answer_s': round(ttft + generated_tokens / decode_rate, 1) if decode_rate else None,
+        'ttft_cold_s': round(statistics.median(r['ttft_s'] for r in cold_runs), 3),
+        'max_prompt_tokens': max(r['prompt_tokens'] for r in cold_runs),
+        'loaded_size_bytes': sampler.size_bytes,
+        'loaded_size_vram_bytes': sampler.size_vram_bytes,
+        'runs': len(cold_runs) + len(runs),
+    }
+
+
+def recommend_num_ctx(result):
+    """Room for the system prompt and largest alert, chat history and a full answer, rounded up to 1024"""
+    needed = result['max_prompt_tokens'] + HISTORY_TOKENS + MAX_ANSWER_TOKENS
+    return min(MAX_NUM_CTX, -(-needed // 1024) * 1024)
+
+
+def measure_concurrency(model_name, num_ctx):
+    """
+    Run the prompt set with 1..MAX_CONCURRENCY requests in flight at the recommended
+    num_ctx. Returns the largest level where total throughput still rises and every
+    request decodes interactively, plus the measurements for each level tried.
+    """
+    options = dict(BENCHMARK_OPTIONS, num_ctx=num_ctx)
+    # Reload at this num_ctx before timing anything
+    timed_generate(model_name, BENCHMARK_PROMPTS[0], options)
+
+    best, best_throughput = 1, 0.0
+    levels = {}
+    for n in range(1, MAX_CONCURRENCY + 1):
+        prompts = [BENCHMARK_PROMPTS[i % len(BENCHMARK_PROMPTS)] for i in range(n)]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=n) as executor:
+            runs = list(executor.map(lambda p: timed_generate(model_name, p, options), prompts))
+        throughput = sum(r['eval_tokens'] for r in runs) / (time.perf_counter() - start)
+        slowest_decode = min(rate(r['eval_tokens'], r['eval_s']) for r in runs)
+        levels[n] = {
+            'total_tokens_per_s': round(throughput, 2),
+            'min_decode_tokens_per_s': round(slowest_decode, 2),
+        }
+        # Requests beyond Ollama's parallel slots just queue, so throughput stops rising
+        if n > 1 and (throughput <= best_throughput * 1.05 or slowest_decode < INTERACTIVE_DECODE_RATE):
+            break
+        best, best_throughput = n, throughput
+    return best, levels
+
+
+def pick_default_model(results):
+    """
+    The largest non-reasoning model that still decodes interactively, otherwise the
+    one with the shortest time to a full answer. Reasoning models spend up to the
+    reasoning budget before answering, so they are only the default if nothing else is installed.
+    """
+    candidates = {name: r for name, r in results.items() if not r['reasoning']} or results
+    interactive = [(r['loaded_size_bytes'], name) for name, r in candidates.items()
+                   if r['decode_tokens_per_s'] >= INTERACTIVE_DECODE_RATE]
+    if interactive:
+        return max(interactive)[1]
+    return min(candidates, key=lambda name: candidates[name]['time_to_answer_s'] or float('inf'))
+
+
+def benchmark_command(args):
+    print("⏱️  Chatbot Model Benchmark")
+    print("=" * 40)
+    if not check_ollama():
+        return 1
+
+    existing = installed_models()
+    models = [m for m in (args.models or [name for name, _ in MODELS]) if m in existing]
+    if not models:
+        print("❌ None of the models are installed. Run: python download_models.py pull")
+        return 1
+
+    host = host_info()
+    results = {}
+    for model_name in models:
+        print(f"\n📦 Benchmarking {model_name}...")
+        try:
+            result = benchmark_model(model_name, args.repeats)
+        except Exception as e:
+            print(f"❌ Error benchmarking {model_name}: {e}")
+            continue
+        result['num_ctx'] = recommend_num_ctx(result)
+        try:
+            result['concurrency'], result['concurrency_levels'] = measure_concurrency(model_name, result['num_ctx'])
+        except Exception as e:
+            print(f"⚠️  Could not measure concurrency for {model_name}: {e}")
+            result['concurrency'] = 1
+        results[model_name] = result
+        print(f"   load {result['load_s']:.2f}s | prompt {result['prompt_eval_tokens_per_s']:.1f} tok/s | "
+              f"decode {result['decode_tokens_per_s']:.1f} tok/s | TTFT {result['ttft_s']:.2f}s | "
+              f"loaded size {result['loaded_size_bytes'] / 1e9:.2f} GB | concurrency {result['concurrency']}")
+
+    if not results:
+        print("❌ No model could be benchmarked, profile not written")
+        return 1
+
+    default_model = pick_default_model(results)
+    profile = {
+        'schema_version': PROFILE_SCHEMA_VERSION,
+        'prompt_set': prompt_set_hash(),
+        'benchmark_options': BENCHMARK_OPTIONS,
+        # num_ctx in each model entry is sized for answers up to this many tokens
+        'num_ctx_answer_tokens': MAX_ANSWER_TOKENS,
+        'created_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'host': host,
+        'loaded_size_source': "Ollama /api/ps allocation for weights and KV cache, not measured process RSS",
+        'default_model': default_model,
+        'models': results,
+    }
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(profile, f, indent=2)
+
+    print(f"\n{'='*50}")
+    print(f"🎉 Default model for this machine: {default_model}")
+    print(f"📝 Profile written to {args.output}")
+    print("Restart the backend to apply it.")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Download and benchmark the chatbot models")
+    subparsers = parser.add_subparsers(dest='command')
+
+    pull_parser = subparsers.add_parser('pull', help="download models concurrently")
+    pull_parser.add_argument('models', nargs='*', help="models to pull (default: all chatbot models)")
+    pull_parser.add_argument('--jobs', type=int, default=len(MODELS), help="parallel downloads")
+    pull_parser.add_argument('--retries', type=int, default=3, help="attempts per model, each resumes the last")
+
+    bench_parser = subparsers.add_parser('benchmark', help="measure installed models and write the profile")
+    bench_parser.add_argument('models', nargs='*', help="models to benchmark (default: all installed chatbot models)")
+    bench_parser.add_argument('--repeats', type=int, default=2, help="runs of the prompt set per model")
+    bench_parser.add_argument('--output', default=PROFILE_PATH, help="where to write the profile JSON")
+
+    args = parser.parse_args(argv)
+    if args.command == 'benchmark':
+        return benchmark_command(args)
+    if args.command is None:
+        args = pull_parser.parse_args([])
+    return pull_command(args)
+
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main())
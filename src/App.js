@@ -41,6 +41,7 @@ function App() {
   const [currentSessionId, setCurrentSessionId] = useState(null);
   const [checklistItems, setChecklistItems] = useState([]);
   const [showChecklist, setShowChecklist] = useState(false);
+  const [modelStats, setModelStats] = useState({});
   
   const chatContainerRef = useRef(null);
   const inputRef = useRef(null);
@@ -52,9 +53,33 @@ function App() {
     }
   }, [messages]);
 
-  // Load conversation sessions on component mount
+  // Start from the default model benchmarked for this machine, and keep its numbers for the labels
   useEffect(() => {
-    loadSessions();
+    axios.get('http://localhost:5001/models')
+      .then(response => {
+        setModelStats(response.data.models || {});
+        const modelKey = Object.keys(MODELS).find(key => MODELS[key] === response.data.default_model);
+        if (modelKey) {
+          setSelectedModel(modelKey);
+        }
+      })
+      .catch(err => console.error('Failed to load models:', err));
+  }, []);
+
+  // Load conversation sessions once on mount, then keep them fresh from the event stream
+  useEffect(() => {
+    let source = null;
+    let cancelled = false;
+    loadSessions().then(lastEventId => {
+      if (!cancelled) {
+        source = subscribeToSessionEvents(lastEventId);
+      }
+    });
+    return () => {
+      cancelled = true;
+      if (source) source.close();
+    };
+    // eslint-disable-next-line
   }, []);
 
   // Extract checklist items from AI responses
@@ -105,11 +130,42 @@ function App() {
     try {
       const response = await axios.get('http://localhost:5001/conversation-history');
       setSessions(response.data.sessions || []);
+      return response.data.last_event_id;
     } catch (err) {
       console.error('Failed to load sessions:', err);
+      return null;
     }
   };
 
+  const sortSessions = (list) =>
+    [...list].sort((a, b) => (b.last_updated || '').localeCompare(a.last_updated || ''));
+
+  // EventSource reconnects on its own and resumes from the last event it received
+  const subscribeToSessionEvents = (lastEventId) => {
+    const source = new EventSource(
+      `http://localhost:5001/session-events?since=${encodeURIComponent(lastEventId || '')}`
+    );
+    const on = (type, handler) =>
+      source.addEventListener(type, (e) => handler(JSON.parse(e.data)));
+
+    on('session-created', (session) => {
+      setSessions(prev => sortSessions([session, ...prev.filter(s => s.session_id !== session.session_id)]));
+    });
+    on('session-updated', (delta) => {
+      setSessions(prev => sortSessions(prev.map(s => s.session_id === delta.session_id ? { ...s, ...delta } : s)));
+    });
+    on('session-renamed', ({ session_id, title }) => {
+      setSessions(prev => prev.map(s => s.session_id === session_id ? { ...s, title } : s));
+    });
+    on('session-deleted', ({ session_id }) => {
+      setSessions(prev => prev.filter(s => s.session_id !== session_id));
+    });
+    on('sessions-cleared', () => setSessions([]));
+    // The server no longer has the events we missed
+    on('reset', () => loadSessions());
+    return source;
+  };
+
   const loadSessionHistory = async (sessionId) => {
     try {
       const response = await axios.get(`http://localhost:5001/session-history/${sessionId}`);
@@ -165,7 +221,6 @@ function App() {
       setError(null);
       setChecklistItems([]);
       setShowChecklist(false);
-      await loadSessions();
     } catch (err) {
       console.error('Failed to create new session:', err);
     }
@@ -221,9 +276,6 @@ function App() {
       if (response.data.sessionId) {
         setCurrentSessionId(response.data.sessionId);
       }
-
-      // Reload sessions after new message
-      await loadSessions();
     } catch (err) {
       setError(err.response?.data?.error || 'Failed to send message. Please try again.');
     } finally {
@@ -271,6 +323,13 @@ function App() {
       .replace(/\n/g, '<br />');
   };
 
+  const getModelLabel = (modelKey) => {
+    const stats = modelStats[MODELS[modelKey]];
+    if (!stats || !stats.decode_tokens_per_s) return modelKey;
+    const answerTime = stats.time_to_answer_s ? `, ~${Math.round(stats.time_to_answer_s)}s per answer` : '';
+    return `${modelKey} · ${Math.round(stats.decode_tokens_per_s)} tok/s${answerTime}`;
+  };
+
   const truncateText = (text, maxLength = 50) => {
     if (text.length <= maxLength) return text;
     return text.substring(0, maxLength) + '...';
@@ -329,7 +388,7 @@ function App() {
               onChange={(e) => setSelectedModel(e.target.value)}
             >
               {Object.keys(MODELS).map(model => (
-                <option key={model} value={model}>{model}</option>
+                <option key={model} value={model}>{getModelLabel(model)}</option>
               ))}
             </select>
           </div>